@@ -1,15 +1,24 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import lxml.etree
+import lxml.html
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from jinja2 import Template
+from jinja2 import Environment
 from datetime import datetime
-import json
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import codecs
+import sys
 
 class PageAudit(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     url: str
     has_schema: bool
     has_json_ld: bool
@@ -20,11 +29,237 @@ class PageAudit(BaseModel):
     suggested_fixes: List[Dict[str, Any]]
     schema_analysis: Dict[str, Any]
 
+# Dane schema.org wyszukiwane w drzewie lxml
+_JSON_LD_XPATH = 'descendant::script[@type="application/ld+json"]'
+_MICRODATA_XPATH = 'descendant-or-self::*[@itemtype]'
+
+# Niepuste węzły tekstowe treści strony (bez kodu skryptów i stylów). Oś descendant::
+# zamiast .// - libxml2 scala wtedy jeden zbiór węzłów zamiast osobnego dla każdego elementu
+_TEXT_XPATH = 'descendant::text()[normalize-space()][not(ancestor::script) and not(ancestor::style)]'
+# Sekcje FAQ: div/section z klasą "faq" lub z "faq" w id (bez względu na wielkość liter)
+_FAQ_XPATH = (
+    "//*[self::div or self::section]"
+    "[contains(concat(' ', normalize-space(@class), ' '), ' faq ')"
+    " or contains(translate(@id, 'FAQ', 'faq'), 'faq')]"
+)
+
+# Przykładowy kod dla pól schema.org, według (typ, pole)
+_SCHEMA_EXAMPLES = {
+    ('Article', 'headline'): '{"@type": "Article", "headline": "Tytuł artykułu"}',
+    ('Article', 'author'): '{"@type": "Article", "author": {"@type": "Person", "name": "Imię Nazwisko"}}',
+    ('Article', 'datePublished'): '{"@type": "Article", "datePublished": "2024-01-01"}',
+    ('Product', 'name'): '{"@type": "Product", "name": "Nazwa produktu"}',
+    ('Product', 'description'): '{"@type": "Product", "description": "Szczegółowy opis produktu"}',
+    ('Product', 'offers'): '{"@type": "Product", "offers": {"@type": "Offer", "price": "99.99", "priceCurrency": "PLN"}}',
+    ('Organization', 'name'): '{"@type": "Organization", "name": "Nazwa organizacji"}',
+    ('Organization', 'url'): '{"@type": "Organization", "url": "https://www.example.com"}',
+    ('WebPage', 'name'): '{"@type": "WebPage", "name": "Tytuł strony"}',
+    ('WebPage', 'description'): '{"@type": "WebPage", "description": "Opis strony"}',
+    ('FAQPage', 'mainEntity'): '''
+{
+    "@type": "FAQPage",
+    "mainEntity": [{
+        "@type": "Question",
+        "name": "Pytanie?",
+        "acceptedAnswer": {
+            "@type": "Answer",
+            "text": "Odpowiedź."
+        }
+    }]
+}
+'''
+}
+
+# Opisy pól schema.org, według (typ, pole)
+_FIELD_DESCRIPTIONS = {
+    ('Article', 'headline'): 'Główny tytuł artykułu',
+    ('Article', 'author'): 'Autor artykułu (osoba lub organizacja)',
+    ('Article', 'datePublished'): 'Data publikacji artykułu',
+    ('Article', 'description'): 'Krótki opis artykułu',
+    ('Article', 'image'): 'Główny obraz artykułu',
+    ('Article', 'publisher'): 'Wydawca artykułu',
+    ('Product', 'name'): 'Nazwa produktu',
+    ('Product', 'description'): 'Szczegółowy opis produktu',
+    ('Product', 'offers'): 'Informacje o ofercie (cena, dostępność)',
+    ('Product', 'image'): 'Zdjęcie produktu',
+    ('Product', 'brand'): 'Marka produktu',
+    ('Product', 'review'): 'Recenzje produktu',
+    ('Organization', 'name'): 'Nazwa organizacji',
+    ('Organization', 'url'): 'Strona główna organizacji',
+    ('Organization', 'logo'): 'Logo organizacji',
+    ('Organization', 'contactPoint'): 'Informacje kontaktowe',
+    ('Organization', 'address'): 'Adres organizacji',
+    ('WebPage', 'name'): 'Tytuł strony',
+    ('WebPage', 'description'): 'Opis zawartości strony',
+    ('WebPage', 'publisher'): 'Wydawca strony',
+    ('WebPage', 'dateModified'): 'Data ostatniej modyfikacji',
+    ('FAQPage', 'mainEntity'): 'Lista pytań i odpowiedzi',
+    ('FAQPage', 'description'): 'Ogólny opis sekcji FAQ'
+}
+
+def _html_parser(response: requests.Response, content: bytes) -> Optional[lxml.html.HTMLParser]:
+    """Parser z kodowaniem z nagłówka HTTP, o ile jest znane i pasuje do treści strony."""
+    # Bez jawnego charset requests zgaduje ISO-8859-1 - wtedy kodowanie wykrywa libxml2 (np. z <meta>)
+    if 'charset=' not in response.headers.get('Content-Type', '').lower():
+        return None
+    encoding = response.encoding
+    try:
+        # Kodeki nietekstowe (rot13, base64, zlib...) nie opisują kodowania strony
+        if not codecs.lookup(encoding)._is_text_encoding:
+            return None
+        # Dekoder przyrostowy toleruje znak ucięty limitem max_page_bytes
+        codecs.getincrementaldecoder(encoding)().decode(content)
+        return lxml.html.HTMLParser(encoding=encoding)
+    except (LookupError, ValueError):
+        # Nieznana nazwa (dla Pythona lub libxml2) albo nagłówek niezgodny z treścią
+        return None
+
+def _compile_required_validator(schema_type: str, required: tuple):
+    """Generuje funkcję dopisującą do `out` brakujące pary (typ, pole) dla słownika JSON-LD lub zbioru itemprop."""
+    lines = ['def validator(data, out):']
+    for field in required:
+        lines.append(f'    if {field!r} not in data: out.append(({schema_type!r}, {field!r}))')
+    if not required:
+        lines.append('    pass')
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['validator']
+
+# Szablon raportu HTML - kompilowany raz, przy imporcie modułu
+_REPORT_TEMPLATE_SRC = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Raport audytu LLM - {{ audit.url }}</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1 { color: #2c3e50; }
+        h2 { color: #34495e; }
+        h3 { color: #2980b9; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f5f5f5; }
+        .recommendation { margin: 10px 0; }
+        .fix { background-color: #f8f9fa; padding: 10px; margin: 10px 0; }
+        .schema-type { color: #2c3e50; font-weight: bold; }
+        .missing-field { color: #e74c3c; }
+        .required-field { color: #c0392b; font-weight: bold; }
+        .recommended-field { color: #27ae60; }
+        .field-description { color: #7f8c8d; font-size: 0.9em; }
+        .status-missing { background-color: #fde8e8; }
+        .status-present { background-color: #e8f5e9; }
+        .schema-details { margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-radius: 5px; }
+        .field-info { margin: 5px 0; }
+    </style>
+</head>
+<body>
+    <h1>Raport audytu LLM dla {{ audit.url }}</h1>
+    
+    <h2>Podstawowe informacje</h2>
+    <table>
+        <tr>
+            <th>Schema.org</th>
+            <td>{{ "Tak" if audit.has_schema else "Nie" }}</td>
+        </tr>
+        <tr>
+            <th>JSON-LD</th>
+            <td>{{ "Tak" if audit.has_json_ld else "Nie" }}</td>
+        </tr>
+        <tr>
+            <th>Liczba słów</th>
+            <td>{{ audit.content_analysis.word_count }}</td>
+        </tr>
+    </table>
+    
+    <h2>Analiza Schema.org</h2>
+    {% if audit.schema_analysis.found_types %}
+    <h3>Znalezione typy danych:</h3>
+    <ul>
+    {% for type in audit.schema_analysis.found_types %}
+        <li class="schema-type">{{ type }}</li>
+    {% endfor %}
+    </ul>
+    {% endif %}
+    
+    <h3>Wymagane pola dla każdego typu:</h3>
+    <table>
+        <tr>
+            <th>Typ</th>
+            <th>Pole</th>
+            <th>Status</th>
+            <th>Opis</th>
+        </tr>
+        {% for type in audit.schema_analysis.found_types %}
+            {% if type in auditor.schema_types %}
+                {% for required in auditor.schema_types[type].required %}
+                <tr class="{{ 'status-missing' if (type, required) in missing_set else 'status-present' }}">
+                    <td>{{ type }}</td>
+                    <td class="required-field">{{ required }}</td>
+                    <td>{{ 'Brakuje' if (type, required) in missing_set else 'Obecne' }}</td>
+                    <td class="field-description">{{ auditor.get_field_description(type, required) }}</td>
+                </tr>
+                {% endfor %}
+                {% for recommended in auditor.schema_types[type].recommended %}
+                <tr>
+                    <td>{{ type }}</td>
+                    <td class="recommended-field">{{ recommended }}</td>
+                    <td>Zalecane</td>
+                    <td class="field-description">{{ auditor.get_field_description(type, recommended) }}</td>
+                </tr>
+                {% endfor %}
+            {% endif %}
+        {% endfor %}
+    </table>
+    
+    {% if audit.schema_analysis.missing_required %}
+    <h3>Brakujące wymagane pola:</h3>
+    <ul>
+    {% for missing in audit.schema_analysis.missing_required %}
+        <li class="missing-field">{{ missing.type }} - {{ missing.field }}</li>
+    {% endfor %}
+    </ul>
+    {% endif %}
+    
+    <h2>Rekomendacje</h2>
+    {% for rec in audit.recommendations %}
+    <div class="recommendation">• {{ rec }}</div>
+    {% endfor %}
+    
+    <h2>Sugerowane poprawki</h2>
+    {% for fix in audit.suggested_fixes %}
+    <div class="fix">
+        <h3>{{ fix.type }}</h3>
+        <p>{{ fix.description }}</p>
+        <pre><code>{{ fix.code }}</code></pre>
+    </div>
+    {% endfor %}
+</body>
+</html>
+'''
+
+_REPORT_TEMPLATE = Environment(autoescape=True).from_string(_REPORT_TEMPLATE_SRC)
+
 class LLMAuditor:
-    def __init__(self):
+    def __init__(self, max_workers: int = 32):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # Kompresja obsługiwana przez zainstalowany urllib3 (br, gdy dostępny pakiet brotli)
+            'Accept-Encoding': ACCEPT_ENCODING
         }
+        # Limit rozmiaru pobieranej (rozpakowanej) strony w bajtach
+        self.max_page_bytes = 2_000_000
+        # Wspólna sesja HTTP - połączenia keep-alive są ponownie używane między stronami
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Pula keep-alive mieści połączenia wszystkich wątków analyze_pages
+        self.max_workers = max_workers
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max_workers,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         # Definicje typów schema.org i ich wymaganych pól
         self.schema_types = {
             'Article': {
@@ -48,8 +283,14 @@ class LLMAuditor:
                 'recommended': ['description']
             }
         }
+        # Niezmienne listy pól i walidatory wymaganych pól generowane raz dla każdego typu
+        self._validators = {}
+        for schema_type, spec in self.schema_types.items():
+            spec['required'] = tuple(spec['required'])
+            spec['recommended'] = tuple(spec['recommended'])
+            self._validators[schema_type] = _compile_required_validator(schema_type, spec['required'])
 
-    def analyze_schema(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def analyze_schema(self, tree: lxml.html.HtmlElement) -> Dict[str, Any]:
         """Szczegółowa analiza danych strukturalnych schema.org."""
         schema_data = {
             'has_schema': False,
@@ -58,45 +299,50 @@ class LLMAuditor:
             'missing_required': [],
             'recommendations': []
         }
+        # Brakujące pola jako krotki (typ, pole) - słowniki powstają dopiero na końcu
+        missing_required = []
+
+        json_ld_texts = [script.text for script in tree.xpath(_JSON_LD_XPATH)]
+        microdata = tree.xpath(_MICRODATA_XPATH)
 
         # Sprawdzanie JSON-LD
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
-        if json_ld_scripts:
+        if json_ld_texts:
             schema_data['has_json_ld'] = True
-            for script in json_ld_scripts:
+            for text in json_ld_texts:
+                if text is None:
+                    continue
                 try:
-                    data = json.loads(script.string)
-                    if isinstance(data, dict):
-                        schema_type = data.get('@type')
-                        if schema_type:
+                    data = orjson.loads(text)
+                except orjson.JSONDecodeError:
+                    continue
+                if isinstance(data, dict):
+                    declared_types = data.get('@type')
+                    # @type może być pojedynczym typem lub listą typów
+                    if not isinstance(declared_types, list):
+                        declared_types = [declared_types]
+                    for schema_type in declared_types:
+                        if schema_type and isinstance(schema_type, str):
+                            schema_type = sys.intern(schema_type)
                             schema_data['found_types'].append(schema_type)
                             # Sprawdzanie wymaganych pól
-                            if schema_type in self.schema_types:
-                                for required in self.schema_types[schema_type]['required']:
-                                    if required not in data:
-                                        schema_data['missing_required'].append({
-                                            'type': schema_type,
-                                            'field': required
-                                        })
-                except:
-                    continue
+                            validator = self._validators.get(schema_type)
+                            if validator:
+                                validator(data, missing_required)
 
         # Sprawdzanie mikrodanych
-        microdata = soup.find_all(attrs={"itemtype": True})
         if microdata:
             schema_data['has_schema'] = True
             for item in microdata:
                 itemtype = item.get('itemtype', '').split('/')[-1]
                 if itemtype:
+                    itemtype = sys.intern(itemtype)
                     schema_data['found_types'].append(itemtype)
                     # Sprawdzanie wymaganych pól
-                    if itemtype in self.schema_types:
-                        for required in self.schema_types[itemtype]['required']:
-                            if not item.find(attrs={"itemprop": required}):
-                                schema_data['missing_required'].append({
-                                    'type': itemtype,
-                                    'field': required
-                                })
+                    validator = self._validators.get(itemtype)
+                    if validator:
+                        # Jedno przejście po poddrzewie zamiast find() dla każdego pola
+                        present = set(item.xpath('descendant::*/@itemprop', smart_strings=False))
+                        validator(present, missing_required)
 
         # Generowanie rekomendacji
         if not schema_data['has_schema'] and not schema_data['has_json_ld']:
@@ -125,9 +371,7 @@ class LLMAuditor:
             })
 
         # Rekomendacje dla brakujących wymaganych pól
-        for missing in schema_data['missing_required']:
-            schema_type = missing['type']
-            field = missing['field']
+        for schema_type, field in missing_required:
             if schema_type in self.schema_types:
                 example = self.get_schema_example(schema_type, field)
                 if example:
@@ -137,75 +381,55 @@ class LLMAuditor:
                         'code': example
                     })
 
+        # Każdy typ raz, w kolejności wystąpienia (np. wiele produktów na liście)
+        schema_data['found_types'] = list(dict.fromkeys(schema_data['found_types']))
+        schema_data['missing_required'] = [
+            {'type': schema_type, 'field': field} for schema_type, field in missing_required
+        ]
+
         return schema_data
 
     def get_schema_example(self, schema_type: str, field: str) -> str:
         """Generuje przykładowy kod dla danego pola schema.org."""
-        examples = {
-            'Article': {
-                'headline': '{"@type": "Article", "headline": "Tytuł artykułu"}',
-                'author': '{"@type": "Article", "author": {"@type": "Person", "name": "Imię Nazwisko"}}',
-                'datePublished': '{"@type": "Article", "datePublished": "2024-01-01"}'
-            },
-            'Product': {
-                'name': '{"@type": "Product", "name": "Nazwa produktu"}',
-                'description': '{"@type": "Product", "description": "Szczegółowy opis produktu"}',
-                'offers': '{"@type": "Product", "offers": {"@type": "Offer", "price": "99.99", "priceCurrency": "PLN"}}'
-            },
-            'Organization': {
-                'name': '{"@type": "Organization", "name": "Nazwa organizacji"}',
-                'url': '{"@type": "Organization", "url": "https://www.example.com"}'
-            },
-            'WebPage': {
-                'name': '{"@type": "WebPage", "name": "Tytuł strony"}',
-                'description': '{"@type": "WebPage", "description": "Opis strony"}'
-            },
-            'FAQPage': {
-                'mainEntity': '''
-{
-    "@type": "FAQPage",
-    "mainEntity": [{
-        "@type": "Question",
-        "name": "Pytanie?",
-        "acceptedAnswer": {
-            "@type": "Answer",
-            "text": "Odpowiedź."
-        }
-    }]
-}
-'''
-            }
-        }
-        return examples.get(schema_type, {}).get(field, '')
+        return _SCHEMA_EXAMPLES.get((schema_type, field), '')
 
     def analyze_page(self, url: str) -> PageAudit:
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                content = response.raw.read(self.max_page_bytes, decode_content=True)
+            # Jedno parsowanie - statystyki i schema.org liczone XPath-em bezpośrednio w libxml2
+            parser = _html_parser(response, content)
+            try:
+                tree = lxml.html.document_fromstring(content, parser=parser)
+            except lxml.etree.ParserError:
+                # Pusta odpowiedź - audyt pustego dokumentu zamiast błędu
+                tree = lxml.html.document_fromstring('<html></html>')
             
             # Analiza struktury nagłówków
             headings = {
-                'h1': len(soup.find_all('h1')),
-                'h2': len(soup.find_all('h2')),
-                'h3': len(soup.find_all('h3'))
+                'h1': int(tree.xpath('count(//h1)')),
+                'h2': int(tree.xpath('count(//h2)')),
+                'h3': int(tree.xpath('count(//h3)'))
             }
             
             # Szczegółowa analiza schema.org
-            schema_analysis = self.analyze_schema(soup)
+            schema_analysis = self.analyze_schema(tree)
             
             # Wyszukiwanie sekcji FAQ
-            faq_sections = []
-            for section in soup.find_all(['div', 'section']):
-                if 'faq' in section.get('class', []) or 'faq' in section.get('id', '').lower():
-                    faq_sections.append(section.get_text(strip=True))
+            faq_sections = [
+                ''.join(text.strip() for text in section.xpath(_TEXT_XPATH, smart_strings=False))
+                for section in tree.xpath(_FAQ_XPATH)
+            ]
             
             # Analiza treści
             content_analysis = {
-                'paragraphs': len(soup.find_all('p')),
-                'lists': len(soup.find_all(['ul', 'ol'])),
-                'images': len(soup.find_all('img')),
-                'links': len(soup.find_all('a')),
-                'word_count': len(soup.get_text().split())
+                'paragraphs': int(tree.xpath('count(//p)')),
+                'lists': int(tree.xpath('count(//ul | //ol)')),
+                'images': int(tree.xpath('count(//img)')),
+                'links': int(tree.xpath('count(//a)')),
+                # Liczenie słów fragment po fragmencie, bez sklejania całego tekstu strony
+                'word_count': sum(len(text.split()) for text in tree.xpath(_TEXT_XPATH, smart_strings=False))
             }
             
             # Generowanie rekomendacji
@@ -242,7 +466,8 @@ class LLMAuditor:
             # Generowanie poprawek
             suggested_fixes = schema_analysis['recommendations']
             
-            return PageAudit(
+            # Pola zbudowane powyżej są już poprawnych typów - bez ponownej walidacji
+            return PageAudit.model_construct(
                 url=url,
                 has_schema=schema_analysis['has_schema'],
                 has_json_ld=schema_analysis['has_json_ld'],
@@ -258,160 +483,25 @@ class LLMAuditor:
             print(f"Błąd podczas analizy strony {url}: {str(e)}")
             return None
 
+    def analyze_pages(self, urls: List[str], workers: int = 8) -> List[Optional[PageAudit]]:
+        """Równoległa analiza wielu stron przez wspólną sesję HTTP."""
+        # Więcej wątków niż połączeń w puli odrzucałoby zwracane połączenia keep-alive
+        with ThreadPoolExecutor(max_workers=min(workers, self.max_workers)) as executor:
+            return list(executor.map(self.analyze_page, urls))
+
     def generate_html_report(self, audit: PageAudit, output_file: str):
         """Generowanie raportu HTML."""
-        template = Template('''
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Raport audytu LLM - {{ audit.url }}</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 40px; }
-        h1 { color: #2c3e50; }
-        h2 { color: #34495e; }
-        h3 { color: #2980b9; }
-        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
-        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-        th { background-color: #f5f5f5; }
-        .recommendation { margin: 10px 0; }
-        .fix { background-color: #f8f9fa; padding: 10px; margin: 10px 0; }
-        .schema-type { color: #2c3e50; font-weight: bold; }
-        .missing-field { color: #e74c3c; }
-        .required-field { color: #c0392b; font-weight: bold; }
-        .recommended-field { color: #27ae60; }
-        .field-description { color: #7f8c8d; font-size: 0.9em; }
-        .status-missing { background-color: #fde8e8; }
-        .status-present { background-color: #e8f5e9; }
-        .schema-details { margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-radius: 5px; }
-        .field-info { margin: 5px 0; }
-    </style>
-</head>
-<body>
-    <h1>Raport audytu LLM dla {{ audit.url }}</h1>
-    
-    <h2>Podstawowe informacje</h2>
-    <table>
-        <tr>
-            <th>Schema.org</th>
-            <td>{{ "Tak" if audit.has_schema else "Nie" }}</td>
-        </tr>
-        <tr>
-            <th>JSON-LD</th>
-            <td>{{ "Tak" if audit.has_json_ld else "Nie" }}</td>
-        </tr>
-        <tr>
-            <th>Liczba słów</th>
-            <td>{{ audit.content_analysis.word_count }}</td>
-        </tr>
-    </table>
-    
-    <h2>Analiza Schema.org</h2>
-    {% if audit.schema_analysis.found_types %}
-    <h3>Znalezione typy danych:</h3>
-    <ul>
-    {% for type in audit.schema_analysis.found_types %}
-        <li class="schema-type">{{ type }}</li>
-    {% endfor %}
-    </ul>
-    {% endif %}
-    
-    <h3>Wymagane pola dla każdego typu:</h3>
-    <table>
-        <tr>
-            <th>Typ</th>
-            <th>Pole</th>
-            <th>Status</th>
-            <th>Opis</th>
-        </tr>
-        {% for type in audit.schema_analysis.found_types %}
-            {% if type in auditor.schema_types %}
-                {% for required in auditor.schema_types[type].required %}
-                <tr class="{{ 'status-missing' if {'type': type, 'field': required} in audit.schema_analysis.missing_required else 'status-present' }}">
-                    <td>{{ type }}</td>
-                    <td class="required-field">{{ required }}</td>
-                    <td>{{ 'Brakuje' if {'type': type, 'field': required} in audit.schema_analysis.missing_required else 'Obecne' }}</td>
-                    <td class="field-description">{{ auditor.get_field_description(type, required) }}</td>
-                </tr>
-                {% endfor %}
-                {% for recommended in auditor.schema_types[type].recommended %}
-                <tr>
-                    <td>{{ type }}</td>
-                    <td class="recommended-field">{{ recommended }}</td>
-                    <td>Zalecane</td>
-                    <td class="field-description">{{ auditor.get_field_description(type, recommended) }}</td>
-                </tr>
-                {% endfor %}
-            {% endif %}
-        {% endfor %}
-    </table>
-    
-    {% if audit.schema_analysis.missing_required %}
-    <h3>Brakujące wymagane pola:</h3>
-    <ul>
-    {% for missing in audit.schema_analysis.missing_required %}
-        <li class="missing-field">{{ missing.type }} - {{ missing.field }}</li>
-    {% endfor %}
-    </ul>
-    {% endif %}
-    
-    <h2>Rekomendacje</h2>
-    {% for rec in audit.recommendations %}
-    <div class="recommendation">• {{ rec }}</div>
-    {% endfor %}
-    
-    <h2>Sugerowane poprawki</h2>
-    {% for fix in audit.suggested_fixes %}
-    <div class="fix">
-        <h3>{{ fix.type }}</h3>
-        <p>{{ fix.description }}</p>
-        <pre><code>{{ fix.code }}</code></pre>
-    </div>
-    {% endfor %}
-</body>
-</html>
-''')
-        
+        # Zbiór brakujących par (typ, pole) - szybkie sprawdzanie w szablonie
+        missing_set = frozenset(
+            (missing['type'], missing['field'])
+            for missing in audit.schema_analysis['missing_required']
+        )
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(template.render(audit=audit, auditor=self))
+            _REPORT_TEMPLATE.stream(audit=audit, auditor=self, missing_set=missing_set).dump(f)
 
     def get_field_description(self, schema_type: str, field: str) -> str:
         """Zwraca opis pola schema.org."""
-        descriptions = {
-            'Article': {
-                'headline': 'Główny tytuł artykułu',
-                'author': 'Autor artykułu (osoba lub organizacja)',
-                'datePublished': 'Data publikacji artykułu',
-                'description': 'Krótki opis artykułu',
-                'image': 'Główny obraz artykułu',
-                'publisher': 'Wydawca artykułu'
-            },
-            'Product': {
-                'name': 'Nazwa produktu',
-                'description': 'Szczegółowy opis produktu',
-                'offers': 'Informacje o ofercie (cena, dostępność)',
-                'image': 'Zdjęcie produktu',
-                'brand': 'Marka produktu',
-                'review': 'Recenzje produktu'
-            },
-            'Organization': {
-                'name': 'Nazwa organizacji',
-                'url': 'Strona główna organizacji',
-                'logo': 'Logo organizacji',
-                'contactPoint': 'Informacje kontaktowe',
-                'address': 'Adres organizacji'
-            },
-            'WebPage': {
-                'name': 'Tytuł strony',
-                'description': 'Opis zawartości strony',
-                'publisher': 'Wydawca strony',
-                'dateModified': 'Data ostatniej modyfikacji'
-            },
-            'FAQPage': {
-                'mainEntity': 'Lista pytań i odpowiedzi',
-                'description': 'Ogólny opis sekcji FAQ'
-            }
-        }
-        return descriptions.get(schema_type, {}).get(field, 'Brak opisu')
+        return _FIELD_DESCRIPTIONS.get((schema_type, field), 'Brak opisu')
 
 def main():
     auditor = LLMAuditor()